@@ -15,19 +15,24 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import curses
+from .backend import CursesBackend
+from .dungeon import DungeonBuilder
 from .game import Game
 from .screen import Screen
-from .constants import QUIT, QUIT_, CONTINUE_, load_configuration
+from .constants import QUIT, QUIT_, CONTINUE_, dungeon_options
 
+# How long to generate for between progress bar updates
+GENERATION_STEP_MS = 50
 
-def build_game_from_config() -> Game:
-    cfg = load_configuration()
-    opts = cfg['DUNGEON']
-    game = Game(
-        max_depth=int(opts['MAX_DEPTH']),
-        prob_three_paths=float(opts['PROB_THREE_PATHS']),
-        prob_room=float(opts['PROB_ROOM']),
-        max_off_path_depth=int(opts['MAX_OFF_PATH_DEPTH']))
+
+def build_game_from_config(sc: Screen = None) -> Game:
+    opts = dungeon_options()
+    builder = DungeonBuilder(**opts)
+    while not builder.done:
+        fraction = builder.step(max_ms=GENERATION_STEP_MS)
+        if sc is not None:
+            sc.progress(fraction)
+    game = Game(dungeon=builder.dungeon, **opts)
     return game
 
 
@@ -36,17 +41,20 @@ def game_loop(sc: Screen) -> int:
     if key == QUIT:
         return QUIT_
 
-    game = build_game_from_config()
+    game = build_game_from_config(sc)
 
     while game.next_play:
         keypress = sc.prompt(game)
         game.handle(keypress)
+        # Catch up on anything typed while that screen was being drawn
+        for keypress in sc.typeahead(game):
+            game.handle(keypress)
 
     return game.exit_code
 
 
 def main(screen):
-    sc = Screen(screen)
+    sc = Screen(CursesBackend(screen))
     sc.redraw()
     sc.intro()
     sc.redraw()
@@ -0,0 +1,295 @@
+#  ADFOD: A Dungeon Full of Demons!
+#  Copyright (C) 2020 Robert A. Enzmann
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["Backend", "CursesBackend", "FramebufferBackend"]
+
+import curses
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Iterable, List, Optional, Tuple
+
+
+class Backend(ABC):
+    """The handful of terminal operations ``Screen`` draws with.
+
+    Coordinates follow curses and are given as ``(y, x)``. As in curses,
+    drawing happens in two steps: ``noutrefresh`` stages a window's changes,
+    and ``doupdate`` sends everything staged to the terminal at once, which
+    marks the end of a frame.
+    """
+
+    @abstractmethod
+    def getmaxyx(self) -> Tuple[int, int]:
+        pass
+
+    @abstractmethod
+    def getsyx(self) -> Tuple[int, int]:
+        pass
+
+    @abstractmethod
+    def addstr(self, y: int, x: int, string: str) -> None:
+        pass
+
+    @abstractmethod
+    def vline(self, y: int, x: int, ch: str, n: int) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def erase(self) -> None:
+        """Blank the window without forcing the whole terminal to repaint"""
+
+    @abstractmethod
+    def touch(self) -> None:
+        """Make the next refresh send the whole window again"""
+
+    @abstractmethod
+    def noutrefresh(self) -> None:
+        """Stage this window's changes for the next ``doupdate``"""
+
+    @abstractmethod
+    def doupdate(self) -> None:
+        """Send every staged change to the terminal, ending the frame"""
+
+    def refresh(self) -> None:
+        self.noutrefresh()
+        self.doupdate()
+
+    @abstractmethod
+    def getkey(self) -> str:
+        pass
+
+    @abstractmethod
+    def pending_key(self) -> Optional[str]:
+        """The next key already typed, or ``None`` rather than waiting"""
+
+    @abstractmethod
+    def is_resized(self, y: int, x: int) -> bool:
+        pass
+
+    @abstractmethod
+    def resize(self, y: int, x: int) -> None:
+        pass
+
+    @abstractmethod
+    def window(self, height: int, width: int, y: int, x: int) -> 'Backend':
+        """A new window drawn over this one, with its own contents"""
+
+
+class CursesBackend(Backend):
+    """Draws to a real terminal through a curses window"""
+
+    def __init__(self, window):
+        self.win = window
+
+    def getmaxyx(self) -> Tuple[int, int]:
+        return self.win.getmaxyx()
+
+    def getsyx(self) -> Tuple[int, int]:
+        return curses.getsyx()
+
+    def addstr(self, y: int, x: int, string: str) -> None:
+        self.win.addstr(y, x, string)
+
+    def vline(self, y: int, x: int, ch: str, n: int) -> None:
+        self.win.vline(y, x, ch, n)
+
+    def clear(self) -> None:
+        self.win.clear()
+
+    def erase(self) -> None:
+        self.win.erase()
+
+    def touch(self) -> None:
+        self.win.touchwin()
+
+    def noutrefresh(self) -> None:
+        self.win.noutrefresh()
+
+    def doupdate(self) -> None:
+        curses.doupdate()
+
+    def getkey(self) -> str:
+        return self.win.getkey()
+
+    def pending_key(self) -> Optional[str]:
+        self.win.nodelay(True)
+        try:
+            return self.win.getkey()
+        except curses.error:
+            return None
+        finally:
+            self.win.nodelay(False)
+
+    def is_resized(self, y: int, x: int) -> bool:
+        return curses.is_term_resized(y, x)
+
+    def resize(self, y: int, x: int) -> None:
+        curses.resizeterm(y, x)
+
+    def window(self, height: int, width: int, y: int, x: int) -> Backend:
+        return CursesBackend(curses.newwin(height, width, y, x))
+
+
+class FramebufferBackend(Backend):
+    """
+    A terminal that only exists in memory, for running the interface
+    headless. Keys are read from ``keys`` until they run out, and every
+    character cell is counted, so the cost of a frame is known exactly:
+    ``writes`` is the total number of cells drawn into windows, and
+    ``frames`` holds, for each ``doupdate``, the number of cells on the
+    display it changed. As with curses, a ``clear`` makes the next
+    ``doupdate`` send every cell of the screen again, while ``erase`` only
+    sends what differs.
+
+    Windows made with ``window`` keep their own contents but share the
+    root's keys, counters and ``display``, which holds what a real terminal
+    would be showing after the last ``doupdate``.
+    """
+
+    def __init__(self,
+                 height: int = 24,
+                 width: int = 80,
+                 keys: Iterable[str] = (),
+                 parent: 'FramebufferBackend' = None,
+                 origin: Tuple[int, int] = (0, 0)):
+
+        self.height = height
+        self.width = width
+        self.keys = deque(keys) if parent is None else parent.keys
+        self.root = self if parent is None else parent.root
+        self.origin = origin
+        self.cells = blank(height, width)
+        self.changed = set()
+        self.resized = False
+        if parent is None:
+            self.display = blank(height, width)
+            self.staged = {}
+            self.cursor = (0, 0)
+            self.writes = 0
+            self.frames = []
+            # Set by ``clear`` to resend the whole screen on ``doupdate``
+            self.repaint = False
+
+    @property
+    def flushes(self) -> int:
+        return len(self.root.frames)
+
+    def getmaxyx(self) -> Tuple[int, int]:
+        return self.height, self.width
+
+    def getsyx(self) -> Tuple[int, int]:
+        return self.root.cursor
+
+    def put(self, y: int, x: int, ch: str) -> None:
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise curses.error(f"write outside window at ({y}, {x})")
+        self.cells[y][x] = ch
+        self.changed.add((y, x))
+        self.root.writes += 1
+
+    def addstr(self, y: int, x: int, string: str) -> None:
+        for ch in string:
+            if ch == '\n':
+                y, x = y + 1, 0
+                continue
+            if x >= self.width:
+                y, x = y + 1, 0
+            self.put(y, x, ch)
+            x += 1
+        if (y, x) == (self.height - 1, self.width):
+            # curses can't move the cursor past the bottom right corner
+            raise curses.error("write to bottom right corner")
+        oy, ox = self.origin
+        self.root.cursor = (oy + y, ox + x)
+
+    def vline(self, y: int, x: int, ch: str, n: int) -> None:
+        for row in range(y, min(y + n, self.height)):
+            self.put(row, x, ch)
+
+    def clear(self) -> None:
+        self.erase()
+        self.root.repaint = True
+
+    def erase(self) -> None:
+        self.cells = blank(self.height, self.width)
+        self.touch()
+
+    def touch(self) -> None:
+        self.changed.update(
+            (y, x) for y in range(self.height) for x in range(self.width))
+
+    def noutrefresh(self) -> None:
+        oy, ox = self.origin
+        staged = self.root.staged
+        for y, x in self.changed:
+            staged[(oy + y, ox + x)] = self.cells[y][x]
+        self.changed.clear()
+
+    def doupdate(self) -> None:
+        root = self.root
+        sent = 0
+        for (y, x), ch in root.staged.items():
+            if y < root.height and x < root.width and root.display[y][x] != ch:
+                root.display[y][x] = ch
+                sent += 1
+        if root.repaint:
+            sent = root.height * root.width
+            root.repaint = False
+        root.staged.clear()
+        root.frames.append(sent)
+
+    def getkey(self) -> str:
+        if not self.keys:
+            raise EOFError("no keys left to read")
+        return self.keys.popleft()
+
+    def pending_key(self) -> Optional[str]:
+        # Every key still queued counts as typed ahead
+        return self.keys.popleft() if self.keys else None
+
+    def set_size(self, height: int, width: int) -> None:
+        """Pretend the user resized the terminal"""
+        self.height, self.width = height, width
+        self.resized = True
+
+    def is_resized(self, y: int, x: int) -> bool:
+        return self.resized
+
+    def resize(self, y: int, x: int) -> None:
+        self.height, self.width = y, x
+        self.cells = blank(y, x)
+        self.changed.clear()
+        self.resized = False
+        if self.root is self:
+            # The terminal forgets what it showed and is drawn from scratch
+            self.display = blank(y, x)
+            self.staged.clear()
+            self.repaint = True
+
+    def window(self, height: int, width: int, y: int, x: int) -> Backend:
+        return FramebufferBackend(height, width, parent=self, origin=(y, x))
+
+    def lines(self) -> List[str]:
+        """What the terminal is showing, one string per row"""
+        return [''.join(row) for row in self.root.display]
+
+
+def blank(height: int, width: int) -> List[List[str]]:
+    return [[' '] * width for _ in range(height)]
@@ -30,6 +30,18 @@ def load_configuration():
     return cfg_
 
 
+def dungeon_options(cfg_=None) -> dict:
+    """Keyword arguments for the dungeon generator from ``[DUNGEON]``"""
+    if cfg_ is None:
+        cfg_ = load_configuration()
+    opts = cfg_['DUNGEON']
+    return dict(
+        max_depth=int(opts['MAX_DEPTH']),
+        prob_three_paths=float(opts['PROB_THREE_PATHS']),
+        prob_room=float(opts['PROB_ROOM']),
+        max_off_path_depth=int(opts['MAX_OFF_PATH_DEPTH']))
+
+
 # String constants are ALLCAPS single words with no leading or trailing flag
 cfg = load_configuration()
 TAB = '    '  # for consistency with terminal tab lengths
@@ -79,6 +91,10 @@ GREETING = f"""
 Press {KEY_DESCRIPTIONS[START]} to generate a new dungeon and begin the game
 """
 
+GENERATING = """
+    Digging out a new dungeon...
+"""
+
 KILL_SCREEN = f"""
     You foolishly attempt to fight the demon and it swallows you whole.
 
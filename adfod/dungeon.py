@@ -14,14 +14,32 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-__all__ = ["generate_dungeon"]
+__all__ = ["generate_dungeon", "DungeonBuilder"]
 
+import weakref
 from random import random, seed, shuffle
+from time import perf_counter
 from .objects import Location, Room, Corridor, Demon, Treasure
-from typing import Union
+from typing import Union, List, Generator, Optional
+
+# Yielded once per location placed, returning what was built
+Work = Generator[None, None, Location]
 
 
 class LateralGenerator:
+    """
+    Builds the side passages hanging off the treasure path. Off-path
+    locations carry no state of their own, so structurally identical ones are
+    hash-consed: every dead end is the same demon room, and a corridor whose
+    paths are the same objects as an existing corridor's is that corridor.
+    The result is a DAG rather than a tree. Corridors are only remembered
+    while something still uses them, so a long run of levels doesn't keep
+    every side passage it ever made.
+
+    The ``room_or_corridor`` and ``generate_children`` generators yield each
+    time they place a location and return what they built, so generation can
+    be paused between any two locations.
+    """
 
     def __init__(self,
                  max_depth: int,
@@ -30,46 +48,82 @@ class LateralGenerator:
                  prob_room: float,
                  random_seed: int):
 
+        if max_depth < 1:
+            raise ValueError("max_depth must be at least 1")
+        check_is_probability(prob_three_paths, "prob_three_paths")
+        check_is_probability(prob_room, "prob_room")
+
         self.max_depth = max_depth
         self.max_off_path_depth = max_off_path_depth
         self.prob_three_paths = prob_three_paths
         self.prob_room = prob_room
         self.random_seed = random_seed
-
-    def room_or_corridor(
-            self,
-            location: Location,
-            depth: int,
-            off_path_depth: int) -> Location:
+        self.demon_room = Room(Demon())
+        self.corridors = weakref.WeakValueDictionary()
+
+    def corridor(self, children: List[Location]) -> Corridor:
+        """Return the shared corridor leading to exactly ``children``"""
+        # Children are themselves shared, so identity is structural equality.
+        # A live corridor keeps its children alive, so their ids can't be
+        # reused while its entry is in the table.
+        key = tuple(map(id, children))
+        corridor = self.corridors.get(key)
+        if corridor is None:
+            corridor = Corridor(children)
+            self.corridors[key] = corridor
+        return corridor
+
+    def room_or_corridor(self, depth: int, off_path_depth: int) -> Work:
 
         if bernoulli(self.prob_room, self.random_seed):
-            return Room(Demon())
-
-        return self.generate_children(location, depth, off_path_depth)
+            yield
+            return self.demon_room
 
-    def generate_children(
-            self,
-            location: Location,
-            depth: int,
-            off_path_depth: int) -> Location:
+        return (yield from self.generate_children(depth, off_path_depth))
 
-        if depth == self.max_depth:
-            return location
+    def generate_children(self, depth: int, off_path_depth: int) -> Work:
 
         num_children = 1 + bernoulli(self.prob_three_paths, self.random_seed)
         one_above_bottom = depth >= (self.max_depth - 1)
         one_above_off_depth = off_path_depth >= (self.max_off_path_depth - 1)
 
         if one_above_bottom or one_above_off_depth:
-            demon_rooms = [Room(Demon()) for _ in range(num_children)]
-            return Corridor(demon_rooms)
+            demon_rooms = [self.demon_room] * num_children
+            yield
+            return self.corridor(demon_rooms)
+
+        children = []
+        for _ in range(num_children):
+            child = yield from self.room_or_corridor(
+                    depth + 1, off_path_depth + 1)
+            children.append(child)
+
+        yield
+        return self.corridor(children)
+
+    def generate_level(
+            self,
+            depth: int) -> Generator[None, None, List[Optional[Location]]]:
+        """
+        Work out the paths leading off the treasure path corridor ``depth``
+        levels below the entrance, in the order they're shown. ``None``
+        marks the path further down the treasure path, which is left to the
+        caller; the last level leads straight to the treasure instead.
+        """
+        if depth == self.max_depth - 1:
+            treasure = Treasure(self.prob_three_paths * self.max_depth)
+            return [Room(treasure)]
+
+        # Lateral passages are cut off by their distance from the treasure
+        lateral_system = yield from self.generate_children(
+                self.max_depth - 2 - depth, 0)
+        paths = [None, *lateral_system.content]
 
-        children = [
-            self.room_or_corridor(location, depth + 1, off_path_depth + 1)
-            for _ in range(num_children)
-        ]
+        if self.random_seed:
+            seed(self.random_seed)
 
-        return Corridor(children)
+        shuffle(paths)
+        return paths
 
 
 class DungeonIterator:
@@ -104,6 +158,94 @@ class Dungeon:
         return DungeonIterator(self.content)
 
 
+class DungeonBuilder:
+    """
+    Generates a dungeon a little at a time. Each call to ``step`` does a
+    bounded amount of work and returns the fraction of the treasure path
+    finished so far; once ``done``, the result is in ``dungeon``.
+
+    Levels are generated from the entrance down, the same order
+    ``export.stream_dungeon`` makes them in, and then joined into the
+    treasure path from the bottom up.
+    """
+
+    def __init__(self,
+                 max_depth: int,
+                 max_off_path_depth: int,
+                 prob_three_paths: float,
+                 prob_room: float,
+                 random_seed: int = None):
+
+        # Every level is generated once and then joined once
+        self.levels = 2 * max_depth
+        self.level = 0
+        self.nodes = 0
+        self.dungeon = None
+        self.generator = LateralGenerator(
+                max_depth,
+                max_off_path_depth,
+                prob_three_paths,
+                prob_room,
+                random_seed
+        )
+        self.work = self.build()
+
+    @property
+    def done(self) -> bool:
+        return self.dungeon is not None
+
+    @property
+    def progress(self) -> float:
+        return 1.0 if self.done else self.level / self.levels
+
+    def build(self) -> Generator[None, None, Dungeon]:
+
+        levels = []
+        for depth in range(self.generator.max_depth):
+            paths = yield from self.generator.generate_level(depth)
+            levels.append(paths)
+            self.level += 1
+
+        corridor_system = None
+        while levels:
+            paths = levels.pop()
+            content = [corridor_system if path is None else path
+                       for path in paths]
+            corridor_system = Corridor(content, on_path=True)
+            yield
+            self.level += 1
+
+        return Dungeon(corridor_system)
+
+    def step(self, max_nodes: int = None, max_ms: float = None) -> float:
+        """
+        Place up to ``max_nodes`` locations, or keep going for up to
+        ``max_ms`` milliseconds, whichever comes first. With neither limit
+        the dungeon is finished in one go. At least one location is placed
+        per call, so repeated calls always finish the dungeon.
+        """
+        if max_nodes is not None and max_nodes < 1:
+            raise ValueError("max_nodes must be at least 1")
+        if self.done:
+            return self.progress
+
+        deadline = None if max_ms is None else perf_counter() + max_ms / 1000
+        placed = 0
+        try:
+            while True:
+                next(self.work)
+                self.nodes += 1
+                placed += 1
+                if max_nodes is not None and placed >= max_nodes:
+                    break
+                if deadline is not None and perf_counter() >= deadline:
+                    break
+        except StopIteration as stop:
+            self.dungeon = stop.value
+
+        return self.progress
+
+
 def generate_dungeon(
         max_depth: int,
         max_off_path_depth: int,
@@ -111,34 +253,29 @@ def generate_dungeon(
         prob_room: float,
         random_seed: int = None) -> Dungeon:
 
-    dungeon = generate_treasure_path(max_depth, prob_three_paths * max_depth)
-    treasure_nodes = list(iter(dungeon))
-    treasure_room = treasure_nodes.pop()
-    corridor_system = Corridor(treasure_room)
-    generator = LateralGenerator(
+    builder = DungeonBuilder(
             max_depth,
             max_off_path_depth,
             prob_three_paths,
             prob_room,
             random_seed
     )
+    builder.step()
+    return builder.dungeon
 
-    for i, treasure_path_node in enumerate(treasure_nodes):
-        lateral_system = generator.generate_children(treasure_path_node, i, 0)
-        level_content = [corridor_system] + lateral_system.content
-
-        if random_seed:
-            seed(random_seed)
-
-        shuffle(level_content)
-        corridor_system = Corridor(level_content, on_path=True)
 
-    return Dungeon(corridor_system)
+def finish(work: Work) -> Location:
+    """Run one of ``LateralGenerator``'s generators to the end"""
+    while True:
+        try:
+            next(work)
+        except StopIteration as stop:
+            return stop.value
 
 
-def check_is_probability(p: float) -> None:
+def check_is_probability(p: float, name: str = "p") -> None:
     if not ((p >= 0.0) & (p <= 1.0)):
-        raise ValueError("p must be between 0.0 and 1.0")
+        raise ValueError(f"{name} must be between 0.0 and 1.0")
 
 
 def bernoulli(p: float, random_seed: Union[None, int]) -> int:
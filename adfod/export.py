@@ -0,0 +1,229 @@
+#  ADFOD: A Dungeon Full of Demons!
+#  Copyright (C) 2020 Robert A. Enzmann
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = [
+    "walk", "node_record", "records", "stream_dungeon",
+    "write_jsonl", "write_dot", "export",
+]
+
+import argparse
+import json
+import random
+import sys
+from typing import Iterable, Iterator, Optional, TextIO, Tuple
+from .constants import CORRIDOR_NAME, dungeon_options
+from .dungeon import Dungeon, LateralGenerator, finish
+from .objects import Location
+
+Visit = Tuple[int, Optional[int], int, Location]
+
+
+def walk(location: Location,
+         node_id: int = 0,
+         parent_id: Optional[int] = None,
+         depth: int = 0) -> Iterator[Visit]:
+    """Yield ``(node_id, parent_id, depth, location)`` in depth-first order.
+
+    Node ids are handed out in pre-order, so a node's id is always greater
+    than its parent's. Locations shared between several places in the
+    dungeon are visited once per place, and their ids are the same positions
+    ``Game`` uses to track where the player has been. The explicit stack
+    only ever holds the unvisited siblings along the current branch, which
+    keeps memory proportional to the depth of the dungeon rather than its
+    size.
+
+    ``node_id``, ``parent_id`` and ``depth`` place ``location`` somewhere
+    other than the root, for walking one branch of a larger dungeon."""
+    stack = [(location, parent_id, depth)]
+    while stack:
+        node, parent_id, depth = stack.pop()
+        yield node_id, parent_id, depth, node
+        if node.is_corridor:
+            for child in reversed(node.content):
+                stack.append((child, node_id, depth + 1))
+        node_id += 1
+
+
+def base_record(node_id: int,
+                parent_id: Optional[int],
+                depth: int,
+                kind: str,
+                on_path: bool) -> dict:
+    return {
+        "id": node_id,
+        "parent": parent_id,
+        "depth": depth,
+        "kind": kind,
+        "on_path": on_path,
+    }
+
+
+def node_record(node_id: int,
+                parent_id: Optional[int],
+                depth: int,
+                location: Location) -> dict:
+    """Flat, JSON-ready description of a single node"""
+    record = base_record(
+            node_id, parent_id, depth, location.name, location.on_path)
+    if location.is_room:
+        record["content"] = location.content.name
+        if location.content.is_treasure:
+            record["value"] = location.content.value
+    else:
+        record["paths"] = len(location.content)
+    return record
+
+
+def records(location: Location) -> Iterator[dict]:
+    """Records for every node under ``location``, in ``walk`` order"""
+    for visit in walk(location):
+        yield node_record(*visit)
+
+
+def stream_dungeon(
+        max_depth: int,
+        max_off_path_depth: int,
+        prob_three_paths: float,
+        prob_room: float,
+        random_seed: int = None) -> Iterator[dict]:
+    """
+    Generate a dungeon from the entrance down, yielding each node's record
+    as soon as it's made, in the same order as ``walk``. The dungeon is
+    never held in memory: the stack only keeps the side passages of each
+    level on the way down that are still to be written, and those are
+    shared between levels by the ``LateralGenerator``.
+
+    Levels come from the same ``LateralGenerator.generate_level`` as
+    ``generate_dungeon`` uses, in the same order, so the same random state
+    gives the same dungeon.
+
+    Bad options raise ``ValueError`` here, before anything is generated.
+    """
+    generator = LateralGenerator(
+            max_depth,
+            max_off_path_depth,
+            prob_three_paths,
+            prob_room,
+            random_seed
+    )
+    return stream_levels(generator)
+
+
+def stream_levels(generator: LateralGenerator) -> Iterator[dict]:
+    """Records for a dungeon made level by level by ``generator``"""
+    node_id = 0
+    # ``None`` stands for the next corridor down the treasure path, which
+    # isn't generated until it's reached
+    stack = [(None, None, 0)]
+
+    while stack:
+        location, parent_id, depth = stack.pop()
+
+        if location is not None:
+            for visit in walk(location, node_id, parent_id, depth):
+                yield node_record(*visit)
+            node_id += location.size
+            continue
+
+        paths = finish(generator.generate_level(depth))
+        record = base_record(node_id, parent_id, depth, CORRIDOR_NAME, True)
+        record["paths"] = len(paths)
+        yield record
+        for path in reversed(paths):
+            stack.append((path, node_id, depth + 1))
+        node_id += 1
+
+
+def write_jsonl(records: Iterable[dict], f: TextIO) -> int:
+    """Write one JSON object per node, returning the number of nodes"""
+    n = 0
+    for record in records:
+        f.write(json.dumps(record))
+        f.write('\n')
+        n += 1
+    return n
+
+
+def write_dot(records: Iterable[dict], f: TextIO) -> int:
+    """Write a Graphviz digraph, returning the number of nodes"""
+    n = 0
+    f.write("digraph dungeon {\n")
+    for record in records:
+        node_id, parent_id = record["id"], record["parent"]
+        label = record["kind"]
+        if "content" in record:
+            label += f"\\n{record['content']}"
+        style = ", style=bold" if record["on_path"] else ""
+        f.write(f'  n{node_id} [label="{label}"{style}];\n')
+        if parent_id is not None:
+            f.write(f"  n{parent_id} -> n{node_id};\n")
+        n += 1
+    f.write("}\n")
+    return n
+
+
+WRITERS = {
+    "jsonl": write_jsonl,
+    "dot": write_dot,
+}
+
+
+def export(dungeon: Dungeon, f: TextIO, fmt: str = "jsonl") -> int:
+    """Stream ``dungeon`` to ``f`` as either ``jsonl`` or ``dot``"""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return WRITERS[fmt](records(dungeon.content), f)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m adfod.export",
+        description="Generate a dungeon from settings.ini, writing out each "
+                    "node as it is made.")
+    parser.add_argument("output", nargs="?", default="-",
+                        help="file to write, or - for stdout (default)")
+    parser.add_argument("-f", "--format", choices=sorted(WRITERS),
+                        default="jsonl")
+    parser.add_argument("-s", "--seed", type=int, default=None,
+                        help="seed for the random number generator")
+    for name, value in dungeon_options().items():
+        parser.add_argument(f"--{name.replace('_', '-')}",
+                            type=type(value), default=value)
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    try:
+        nodes = stream_dungeon(
+                args.max_depth,
+                args.max_off_path_depth,
+                args.prob_three_paths,
+                args.prob_room)
+    except ValueError as err:
+        parser.error(str(err))
+    write = WRITERS[args.format]
+
+    if args.output == "-":
+        write(nodes, sys.stdout)
+    else:
+        with open(args.output, "w") as f:
+            write(nodes, f)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,12 +16,19 @@
 
 __all__ = ['Game']
 
-from .dungeon import generate_dungeon
+from .dungeon import Dungeon, generate_dungeon
+from .minimap import Minimap
 from typing import List, Union
 from . import constants as c
 
 
 class Game:
+    """
+    One player's session in a dungeon. The dungeon itself is never modified,
+    so a pre-built one can be handed to any number of games at once; all the
+    state of a playthrough, including which positions have been visited,
+    lives here.
+    """
 
     exit_actions = {
         c.QUIT: c.QUIT_,
@@ -35,7 +42,8 @@ class Game:
                  max_depth=5,
                  prob_three_paths=0.5,
                  prob_room=0.75,
-                 max_off_path_depth=2):
+                 max_off_path_depth=2,
+                 dungeon: Dungeon = None):
 
         self.random_seed = random_seed
         self.next_play = c.CONTINUE_
@@ -43,18 +51,27 @@ class Game:
         self.prob_three_paths = prob_three_paths
         self.prob_room = prob_room
         self.max_off_path_depth = max_off_path_depth
-        self.dungeon = generate_dungeon(
-                self.max_depth,
-                self.max_off_path_depth,
-                self.prob_three_paths,
-                self.prob_room,
-                self.random_seed
-        )
+        if dungeon is None:
+            dungeon = generate_dungeon(
+                    self.max_depth,
+                    self.max_off_path_depth,
+                    self.prob_three_paths,
+                    self.prob_room,
+                    self.random_seed
+            )
+        else:
+            self.max_depth = len(dungeon)
+        self.dungeon = dungeon
         self.entrance = self.dungeon.content
         self.current_level = self.entrance
         self.current_depth = 1
-        self.current_level.visited = True
+        self.position = 0
+        # One bit for each position in the dungeon, in pre-order
+        self.visited = bytearray((self.entrance.size + 7) // 8)
+        self.visit(self.position)
         self.parent_corridors = []
+        self.parent_positions = []
+        self.minimap = Minimap(self.entrance)
         self.exit_code = None
 
     def go_up(self) -> None:
@@ -63,6 +80,8 @@ class Game:
         else:
             self.current_depth -= 1
             self.current_level = self.parent_corridors.pop()
+            self.position = self.parent_positions.pop()
+            self.minimap.ascend()
 
     @property
     def num_options(self) -> int:
@@ -91,12 +110,34 @@ class Game:
 
         return move_options
 
+    def visit(self, position: int) -> None:
+        self.visited[position >> 3] |= 1 << (position & 7)
+
+    def has_visited(self, position: int) -> bool:
+        return bool(self.visited[position >> 3] & (1 << (position & 7)))
+
+    @property
+    def paths_visited(self) -> List[bool]:
+        """Whether each path leading on from here has been taken before"""
+        return [
+            self.has_visited(
+                self.current_level.child_position(self.position, i))
+            for i in range(self.num_options)
+        ]
+
+    def look(self) -> str:
+        return self.current_level.look(self.paths_visited)
+
     def move_sideways(self, direction: str) -> None:
         self.parent_corridors.append(self.current_level)
+        self.parent_positions.append(self.position)
         content_direction = self.move_options.index(direction)
+        self.position = self.current_level.child_position(
+                self.position, content_direction)
         self.current_level = self.current_level.content[content_direction]
         self.current_depth += 1
-        self.current_level.visited = True
+        self.visit(self.position)
+        self.minimap.descend(content_direction, self.current_level)
 
     def move_level(self, direction: str) -> None:
         """Modify game state using one of LEFT, RIGHT, UP, or STRAIGHT"""
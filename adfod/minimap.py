@@ -0,0 +1,162 @@
+#  ADFOD: A Dungeon Full of Demons!
+#  Copyright (C) 2020 Robert A. Enzmann
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["Minimap"]
+
+from typing import List, Tuple
+from .objects import Location
+
+Cell = Tuple[int, int]
+
+CORRIDOR_SYMBOL = '#'
+DEMON_SYMBOL = 'D'
+TREASURE_SYMBOL = '$'
+PLAYER_SYMBOL = '@'
+STRAIGHT_LINK = '-'
+BRANCH_LINK = '\\'
+DOWN_LINK = '|'
+CROSSED_LINK = '+'
+
+
+def symbol(location: Location) -> str:
+    if location.is_corridor:
+        return CORRIDOR_SYMBOL
+    if location.content.is_treasure:
+        return TREASURE_SYMBOL
+    return DEMON_SYMBOL
+
+
+class Minimap:
+    """Layout of the explored part of the dungeon, grown one step at a time.
+
+    Each node gets a fixed cell the first time it is entered, two columns to
+    the right of its parent. The first child explored from a corridor stays on
+    the parent's row, and any later sibling opens a fresh row at the bottom of
+    the map, so placing a node never moves one that is already laid out. A
+    line runs down from the parent to that row, crossing any links in its
+    way, so drawing a new branch costs one cell per row it spans; every
+    other move touches a constant number of cells. Changed cells are queued
+    in ``dirty`` until the screen asks for them with ``flush``.
+
+    The map can outgrow the panel showing it, so the panel looks through a
+    viewport whose top left corner is ``(top, left)``. ``scroll_to`` moves
+    it whenever the player would leave it.
+    """
+
+    def __init__(self, entrance: Location):
+        self.cells = {}      # (y, x) -> symbol
+        self.dirty = set()   # cells waiting to be drawn
+        self.positions = []  # node -> (y, x)
+        self.branches = []   # node -> number of children explored
+        self.children = {}   # (node, child index) -> node
+        self.trail = []      # nodes from the entrance to the player
+        self.height = 0
+        self.width = 0
+        self.top = 0
+        self.left = 0
+        self.trail.append(self._place((0, 0), entrance))
+
+    @property
+    def current(self) -> Cell:
+        return self.positions[self.trail[-1]]
+
+    def _mark(self, cell: Cell, char: str) -> None:
+        self.cells[cell] = char
+        self.dirty.add(cell)
+        y, x = cell
+        self.height = max(self.height, y + 1)
+        self.width = max(self.width, x + 1)
+
+    def _place(self, cell: Cell, location: Location) -> int:
+        self._mark(cell, symbol(location))
+        self.positions.append(cell)
+        self.branches.append(0)
+        return len(self.positions) - 1
+
+    def _connect(self, x: int, top: int, bottom: int) -> None:
+        """Draw a line down column ``x`` between rows ``top`` and ``bottom``"""
+        # Only links ever sit in a node's column plus one
+        for y in range(top + 1, bottom):
+            char = self.cells.get((y, x))
+            if char is None:
+                self._mark((y, x), DOWN_LINK)
+            elif char != DOWN_LINK:
+                self._mark((y, x), CROSSED_LINK)
+
+    def descend(self, index: int, location: Location) -> None:
+        """Record a move into child ``index`` of the current node"""
+        parent = self.trail[-1]
+        self.dirty.add(self.positions[parent])
+        node = self.children.get((parent, index))
+
+        if node is None:
+            y, x = self.positions[parent]
+            if self.branches[parent]:
+                y, link = self.height, BRANCH_LINK
+                self._connect(x + 1, self.positions[parent][0], y)
+            else:
+                link = STRAIGHT_LINK
+            self.branches[parent] += 1
+            self._mark((y, x + 1), link)
+            node = self._place((y, x + 2), location)
+            self.children[(parent, index)] = node
+
+        self.trail.append(node)
+        self.dirty.add(self.positions[node])
+
+    def ascend(self) -> None:
+        """Record a move back to the parent of the current node"""
+        if len(self.trail) > 1:
+            self.dirty.add(self.positions[self.trail.pop()])
+            self.dirty.add(self.current)
+
+    def char_at(self, cell: Cell) -> str:
+        return PLAYER_SYMBOL if cell == self.current else self.cells[cell]
+
+    def scroll_to(self, rows: int, cols: int) -> bool:
+        """
+        Make sure the player is inside a ``rows`` by ``cols`` viewport,
+        centring on them if they aren't. Returns whether the view moved, in
+        which case everything in it has to be drawn again.
+        """
+        y, x = self.current
+        top, left = self.top, self.left
+        if not top <= y < top + rows:
+            top = max(y - rows // 2, 0)
+        if not left <= x < left + cols:
+            left = max(x - cols // 2, 0)
+        moved = (top, left) != (self.top, self.left)
+        self.top, self.left = top, left
+        return moved
+
+    def flush(self, rows: int, cols: int) -> List[Tuple[int, int, str]]:
+        """
+        Return ``(y, x, char)`` for every cell changed since the last flush
+        that falls inside the ``rows`` by ``cols`` viewport, with ``y`` and
+        ``x`` relative to its corner. Changes outside it are dropped, since
+        scrolling to them redraws the whole view anyway.
+        """
+        changes = []
+        for y, x in self.dirty:
+            view_y, view_x = y - self.top, x - self.left
+            if 0 <= view_y < rows and 0 <= view_x < cols:
+                changes.append((view_y, view_x, self.char_at((y, x))))
+        self.dirty.clear()
+        return changes
+
+    def invalidate(self) -> None:
+        """Mark the whole map as changed, e.g. after the view has moved"""
+        self.dirty.update(self.cells)
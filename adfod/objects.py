@@ -16,7 +16,7 @@
 
 __all__ = ("Demon", "Treasure", "Corridor", "Room", "Location")
 
-from typing import Union, Iterable
+from typing import Union, Iterable, Sequence
 from .constants import (
         CORRIDOR_NAME, DEMON_NAME, TREASURE_NAME,
         STAIRWAY_DESC, ROOM_NAME
@@ -35,8 +35,14 @@ class Named:
 
 
 class Demon(Named):
-    """Watch out for these."""
+    """Watch out for these. Every demon is the same demon."""
     name = DEMON_NAME
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
 
 
 class Treasure(Named):
@@ -52,10 +58,18 @@ class Treasure(Named):
 
 
 class Location(Named):
+    """
+    Locations may be shared between several places in the same dungeon, so
+    they hold no per-game state. Whether a location has been visited is
+    tracked by the game, using the location's pre-order position in the
+    dungeon; ``size`` is the number of positions the location spans, and
+    ``height`` is how many levels further down its deepest room is.
+    """
     content = None
-    visited = False
     on_path = False
     level = 1
+    size = 1
+    height = 0
 
     @property
     def is_room(self):
@@ -65,11 +79,15 @@ class Location(Named):
     def is_corridor(self):
         return self.name == CORRIDOR_NAME
 
-    def look(self):
+    def describe(self, visited: Sequence[bool] = None) -> str:
+        return str(self)
+
+    def look(self, visited: Sequence[bool] = None):
+        """``visited`` says which of the paths leading on have been taken"""
         if self.is_room:
-            return f"You are in {str(self).lower()}"
+            return f"You are in {self.describe(visited).lower()}"
         else:
-            return f"There is a {str(self).lower()}"
+            return f"There is a {self.describe(visited).lower()}"
 
 
 class Corridor(Location):
@@ -82,35 +100,52 @@ class Corridor(Location):
                  on_path: bool = False):
 
         cont_iter = [content] if not isinstance(content, Iterable) else content
-        self.content = list(cont_iter)
+        self.content = tuple(cont_iter)
         self.on_path = on_path
-        self.visited = False
+        self.size = 1 + sum(location.size for location in self.content)
+        self.height = 1 + max(location.height for location in self.content)
 
         if len(self.content) > 3:
             raise ValueError(f"{CORRIDOR_NAME} can't have more than 3 paths.")
 
-    def __str__(self):
+    def child_position(self, position: int, index: int) -> int:
+        """Pre-order position of path ``index`` when we're at ``position``"""
+        return position + 1 + sum(
+            location.size for location in self.content[:index])
+
+    def describe(self, visited: Sequence[bool] = None) -> str:
         content_size = len(self.content)
+        if visited is None:
+            visited = [False] * content_size
         out_string = "A corridor with "
 
         if content_size == 1:
-            location = self.content[0]
-            nother = "nother" * location.is_corridor * location.visited
-            out_string += f"a{nother} {description(location)} straight ahead."
+            location, = self.content
+            seen, = visited
+            nother = "nother" * location.is_corridor * seen
+            desc = description(location, seen)
+            out_string += f"a{nother} {desc} straight ahead."
             return out_string
         elif content_size == 2:
             left, right = self.content
-            out_string += f"a {description(left)} to the left "
+            left_seen, right_seen = visited
+            out_string += f"a {description(left, left_seen)} to the left "
         else:
             left, middle, right = self.content
-            out_string += f"a {description(left)} to the left, "
-            out_string += f"a {description(middle)} straight ahead, "
+            left_seen, middle_seen, right_seen = visited
+            out_string += f"a {description(left, left_seen)} to the left, "
+            out_string += \
+                f"a {description(middle, middle_seen)} straight ahead, "
 
-        nother = "nother" * right.is_corridor * right.visited
-        out_string += f"and a{nother} {description(right)} to the right."
+        nother = "nother" * right.is_corridor * right_seen
+        desc = description(right, right_seen)
+        out_string += f"and a{nother} {desc} to the right."
 
         return out_string
 
+    def __str__(self):
+        return self.describe()
+
 
 class Room(Location):
     """Contains either the treasure or a demon."""
@@ -119,7 +154,6 @@ class Room(Location):
 
     def __init__(self, content: Union[Demon, Treasure]):
         self.content = content
-        self.visited = False
 
     @property
     def on_path(self):
@@ -131,5 +165,5 @@ class Room(Location):
         return f"A room full of {TREASURE_NAME}."
 
 
-def description(location: Location):
-    return location.name if location.visited else STAIRWAY_DESC
+def description(location: Location, visited: bool = False):
+    return location.name if visited else STAIRWAY_DESC
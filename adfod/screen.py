@@ -16,10 +16,18 @@
 
 __all__ = ['Screen']
 
-import curses
 from . import constants as c
+from .backend import Backend
 from .game import Game
-from typing import Union, List, Callable
+from .minimap import Minimap
+from typing import Union, List, Callable, Iterator
+
+# Widest the minimap panel may get, as a fraction of the terminal width
+MINIMAP_MAX_FRACTION = 3
+# Narrowest the minimap panel is worth showing at
+MINIMAP_MIN_WIDTH = 8
+# Most typed-ahead keys to apply before drawing the screen again
+TYPEAHEAD_LIMIT = 16
 
 
 def guard(string: str, width_or_length: int) -> str:
@@ -62,8 +70,17 @@ def wrap_string(s: str, max_line_len: int) -> str:
 
 class Screen:
 
-    def __init__(self, curses_screen):
-        self.sc = curses_screen
+    def __init__(self, backend: Backend):
+        self.sc = backend
+        self.text_win = None
+        self.text_shape = None
+        self.minimap_win = None
+        self.minimap_shape = None
+        # Whether the whole screen has been drawn over our windows
+        self.covered = True
+        # Screen size the generation message was last drawn for, if it's
+        # still showing
+        self.progress_shape = None
 
     def guard_y(self, string: str):
         max_y, _ = self.sc.getmaxyx()
@@ -77,25 +94,33 @@ class Screen:
 
         def _greeting() -> str:
             self.draw_lines(c.GREETING.splitlines())
-            return self.sc.getkey()
+            return self.read_key()
 
         return self.wait(_greeting, [c.START, c.QUIT])
 
     def redraw(self) -> None:
         self.sc.clear()
         self.sc.refresh()
-
-    def draw_lines(self, lines: List[str]) -> None:
-        self.sc.clear()
-        max_y, max_x = self.sc.getmaxyx()
+        self.covered = True
+        self.progress_shape = None
+
+    def draw_lines(self, lines: List[str], win: Backend = None) -> None:
+        if win is None:
+            win = self.sc
+            win.clear()
+            self.covered = True
+            self.progress_shape = None
+        else:
+            win.erase()
+        max_y, max_x = win.getmaxyx()
 
         for i, line in enumerate(lines):
             if i >= max_y - 1:
                 break
-            self.println(guard(line, max_x), x=0, y=i)
+            self.println(guard(line, max_x), x=0, y=i, win=win)
 
-    def print_paragraph(self, paragraph: str) -> None:
-        _, max_x = self.sc.getmaxyx()
+    def print_paragraph(self, paragraph: str, win: Backend = None) -> None:
+        _, max_x = (win or self.sc).getmaxyx()
 
         def wrap(s):
             return wrap_string(s, max_line_len=max_x)
@@ -103,16 +128,106 @@ class Screen:
         # Assuming newline characters already delineate paragraphs, this `map`
         # assures we only wrap those paragraphs that are too long.
         out_string = '\n'.join(map(wrap, paragraph.splitlines()))
-        self.draw_lines(out_string.splitlines())
+        self.draw_lines(out_string.splitlines(), win)
 
-    def screen_updater(self, screen_string: str) -> Callable:
+    def screen_updater(self, screen_string: str,
+                       gs: Game = None) -> Callable:
 
         def _updater():
-            self.print_paragraph(screen_string)
-            return self.sc.getkey()
+            if gs is None:
+                self.print_paragraph(screen_string)
+            else:
+                _, max_x = self.sc.getmaxyx()
+                panel_x = self.minimap_width(gs)
+                text_win = self.text_window(max_x - panel_x)
+                self.print_paragraph(screen_string, text_win)
+                self.draw_minimap(gs.minimap, panel_x)
+                self.covered = False
+                self.progress_shape = None
+            return self.read_key()
 
         return _updater
 
+    def text_window(self, width: int) -> Backend:
+        """
+        The part of the screen left of the minimap. Drawing the text here
+        rather than on the whole screen means it can be wiped and redrawn
+        without touching the map.
+        """
+        max_y, _ = self.sc.getmaxyx()
+        shape = (max_y, width, 0, 0)
+        if shape != self.text_shape:
+            self.text_win = self.sc.window(*shape)
+            self.text_shape = shape
+        return self.text_win
+
+    def minimap_width(self, gs: Game) -> int:
+        """Columns reserved on the right for the map, or 0 if it won't fit"""
+        _, max_x = self.sc.getmaxyx()
+        # Two columns per level, including the entrance, plus the border and
+        # its gap on the left and a blank column on the right. If that's too
+        # wide the panel scrolls instead.
+        width = 2 * gs.entrance.height + 4
+        width = min(width, max_x // MINIMAP_MAX_FRACTION)
+        if width < MINIMAP_MIN_WIDTH:
+            return 0
+        return width
+
+    def draw_minimap(self, minimap: Minimap, width: int) -> None:
+        """
+        The map lives in its own window so that clearing the main screen
+        leaves it intact. Only the cells the minimap reports as changed are
+        written, unless the view scrolls to follow the player. If something
+        was drawn over the whole screen since the last frame, the panel is
+        sent to the terminal again as it stands.
+        """
+        if width == 0:
+            return
+
+        max_y, max_x = self.sc.getmaxyx()
+        # Leave out the border and its gap, plus the bottom row and right
+        # column so we never write to the corner curses refuses to.
+        rows, cols = max_y - 1, width - 3
+        shape = (max_y, width, 0, max_x - width)
+        redraw = minimap.scroll_to(rows, cols)
+        if shape != self.minimap_shape:
+            self.minimap_win = self.sc.window(*shape)
+            self.minimap_shape = shape
+            redraw = True
+
+        win = self.minimap_win
+        if redraw:
+            win.erase()
+            win.vline(0, 0, '|', max_y)
+            minimap.invalidate()
+        elif self.covered:
+            win.touch()
+        for y, x, ch in minimap.flush(rows, cols):
+            win.addstr(y, x + 2, ch)
+        win.noutrefresh()
+
+    def progress(self, fraction: float) -> None:
+        """
+        Show how far along dungeon generation is, as a bar. The message is
+        only drawn the first time; after that just the bar's row is written,
+        so the terminal isn't repainted on every update.
+        """
+        lines = c.GENERATING.splitlines()
+        max_y, max_x = self.sc.getmaxyx()
+        width = max_x - 2 * len(c.TAB) - 2
+        if len(lines) + 1 >= max_y - 1 or width < 1:
+            return
+        shape = (max_y, max_x)
+        if shape != self.progress_shape:
+            self.sc.erase()
+            for i, line in enumerate(lines):
+                self.println(guard(line, max_x), x=0, y=i)
+            self.progress_shape = shape
+        filled = int(width * fraction)
+        bar = f"{c.TAB}[{'#' * filled}{' ' * (width - filled)}]"
+        self.println(bar, x=0, y=len(lines) + 1)
+        self.sc.doupdate()
+
     def intro(self) -> str:
         logo = load_logo().splitlines()
 
@@ -122,7 +237,7 @@ class Screen:
             max_y, max_x = self.sc.getmaxyx()
             start_prompt = self.guard_x(f"{c.TAB}Press SPACE to start.")
             self.println(start_prompt, x=0, y=max_y - 1)
-            return self.sc.getkey()
+            return self.read_key()
 
         return self.wait(draw_logo, c.START)
 
@@ -132,28 +247,37 @@ class Screen:
         key = str(c.RESERVED_)
         while key not in kill_keys:
             y, x = self.sc.getmaxyx()
-            if curses.is_term_resized(y, x):
+            if self.sc.is_resized(y, x):
                 self.sc.clear()
-                curses.resizeterm(y, x)
+                self.sc.resize(y, x)
                 self.sc.refresh()
+                self.covered = True
+                self.progress_shape = None
             key = update_method()
 
         return key
 
-    def println(self, string, x=None, y=None) -> None:
+    def read_key(self) -> str:
+        """Finish drawing the frame, then wait for the player"""
+        self.sc.doupdate()
+        return self.sc.getkey()
+
+    def println(self, string, x=None, y=None, win: Backend = None) -> None:
         """
         Print a line beginning on the start of the next line
         from wherever the cursor was last put. The (y, x) convention of curses
         is also fairly annoying, so we make it explicit with this print
         signature.
         """
-        _y, _x = curses.getsyx()
+        if win is None:
+            win = self.sc
+        _y, _x = self.sc.getsyx()
         if x is None:
             x = 0
         if y is None:
             y = _y + 1
-        self.sc.addstr(y, x, string)
-        self.sc.refresh()
+        win.addstr(y, x, string)
+        win.noutrefresh()
 
     def string_your_options(self, options: List[str]) -> str:
         menu_strings = (
@@ -166,23 +290,40 @@ class Screen:
         if options is None:
             options = gs.move_options
         if gs.next_play == c.DIE_:
-            kill_screen = self.screen_updater(c.KILL_SCREEN)
+            kill_screen = self.screen_updater(c.KILL_SCREEN, gs)
             return self.wait(kill_screen, [c.START, c.QUIT])
         if gs.next_play == c.KILLED_BY_TREASURE_:
-            kill_screen = self.screen_updater(c.TREASURE_SCREEN)
+            kill_screen = self.screen_updater(c.TREASURE_SCREEN, gs)
             return self.wait(kill_screen, [c.START, c.QUIT])
         else:
             level = level_string(gs)
-            look_string = gs.current_level.look()
+            look_string = gs.look()
             options_list = self.string_your_options(options)
             screen_string = level + look_string + options_list
-            options_screen = self.screen_updater(screen_string)
+            options_screen = self.screen_updater(screen_string, gs)
             return self.wait(options_screen, options + [c.QUIT])
 
     def prompt(self, gs: Game) -> str:
-        self.sc.clear()
         return self.look_and_react(gs)
 
+    def typeahead(self, gs: Game,
+                  limit: int = TYPEAHEAD_LIMIT) -> Iterator[str]:
+        """
+        Yield the moves the player has already typed, without waiting for
+        more, so they can all be handled before the next screen is drawn.
+        Keys that aren't an option at that point are dropped, as ``wait``
+        would. We stop after ``limit`` keys so the screen keeps up, and as
+        soon as the game ends so the player sees how.
+        """
+        for _ in range(limit):
+            if gs.next_play in (c.QUIT_, c.DIE_, c.KILLED_BY_TREASURE_):
+                return
+            key = self.sc.pending_key()
+            if key is None:
+                return
+            if key in gs.move_options + [c.QUIT]:
+                yield key
+
 
 def level_string(gs: Game) -> str:
     if gs.current_level.is_corridor:
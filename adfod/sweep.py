@@ -0,0 +1,233 @@
+#  ADFOD: A Dungeon Full of Demons!
+#  Copyright (C) 2020 Robert A. Enzmann
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Generate many dungeons across a process pool and check that each one is
+well formed. Every combination of the given settings is run once per seed;
+a JSON line is printed for each dungeon as it finishes. Running summaries
+for each combination of settings are printed as results come in, and a final
+one for each combination once they're all done.
+
+    python -m adfod.sweep --seeds 1000 --max-depth 5 7 9 --prob-room 0.25 0.5
+
+Settings that aren't given on the command line are read from settings.ini.
+The exit status is 1 if any dungeon breaks an invariant.
+"""
+
+__all__ = ["check_dungeon", "sweep"]
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Tuple
+from .constants import dungeon_options
+from .dungeon import Dungeon, generate_dungeon
+from .export import walk
+
+Job = Tuple[int, Dict]
+
+
+def check_dungeon(dungeon: Dungeon, max_depth: int) -> Dict:
+    """
+    Walk ``dungeon`` once, collecting statistics and broken invariants.
+    There's no need to look for corridors with more than 3 paths here, as
+    ``Corridor`` refuses to be built with them; ``run_job`` records that
+    error like any other raised while generating.
+    """
+    branching = Counter()
+    nodes = set()
+    positions = 0
+    rooms = 0
+    treasure_depths = []
+    errors = []
+
+    for _, _, depth, location in walk(dungeon.content):
+        positions += 1
+        nodes.add(id(location))
+        if location.is_corridor:
+            branching[len(location.content)] += 1
+        else:
+            rooms += 1
+            if location.content.is_treasure:
+                treasure_depths.append(depth)
+
+    if len(treasure_depths) != 1:
+        errors.append(f"{len(treasure_depths)} treasure rooms")
+    elif treasure_depths[0] != max_depth:
+        errors.append(f"treasure at depth {treasure_depths[0]}")
+
+    return {
+        "positions": positions,
+        "nodes": len(nodes),
+        "rooms": rooms,
+        "branching": dict(branching),
+        "errors": errors,
+    }
+
+
+def run_job(job: Job) -> Dict:
+    seed, options = job
+    # ``generate_dungeon`` re-seeds before every draw when handed a seed, so
+    # seed the module's generator once instead.
+    random.seed(seed)
+    result = {"seed": seed, "options": options}
+    start = time.perf_counter()
+    try:
+        dungeon = generate_dungeon(**options)
+        result["seconds"] = time.perf_counter() - start
+        result.update(check_dungeon(dungeon, options["max_depth"]))
+    except Exception as err:
+        # Report it against this seed instead of bringing down the sweep
+        result["seconds"] = time.perf_counter() - start
+        result["errors"] = [f"{type(err).__name__}: {err}"]
+    return result
+
+
+def option_grid(grid: Dict[str, List]) -> Iterator[Dict]:
+    names = sorted(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def sweep(seeds: Iterable[int],
+          grid: Dict[str, List],
+          workers: int = None,
+          chunksize: int = 16) -> Iterator[Dict]:
+    """Yield results for every seed and combination of options in ``grid``,
+    in whatever order the pool finishes them."""
+    jobs = ((seed, options)
+            for options in option_grid(grid)
+            for seed in seeds)
+    with Pool(workers) as pool:
+        yield from pool.imap_unordered(run_job, jobs, chunksize)
+
+
+class Summary:
+    """Running totals for all the dungeons generated with one set of options"""
+
+    def __init__(self, options: Dict):
+        self.options = options
+        self.runs = 0
+        self.failures = 0
+        self.generated = 0
+        self.positions = 0
+        self.min_positions = None
+        self.max_positions = None
+        self.nodes = 0
+        self.branching = Counter()
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, result: Dict) -> None:
+        self.runs += 1
+        self.failures += bool(result["errors"])
+        if "positions" not in result:
+            return
+        positions = result["positions"]
+        self.generated += 1
+        self.positions += positions
+        if self.generated == 1:
+            self.min_positions = self.max_positions = positions
+        else:
+            self.min_positions = min(self.min_positions, positions)
+            self.max_positions = max(self.max_positions, positions)
+        self.nodes += result["nodes"]
+        self.branching.update(result["branching"])
+        self.seconds += result["seconds"]
+        self.max_seconds = max(self.max_seconds, result["seconds"])
+
+    def as_dict(self, final: bool = False) -> Dict:
+        summary = {
+            "summary": True,
+            "final": final,
+            "options": self.options,
+            "runs": self.runs,
+            "failures": self.failures,
+        }
+        # Statistics only cover the dungeons that could be generated
+        generated = self.generated
+        if generated:
+            summary.update({
+                "positions": {
+                    "min": self.min_positions,
+                    "mean": self.positions / generated,
+                    "max": self.max_positions,
+                },
+                "shared_fraction": 1 - self.nodes / self.positions,
+                "branching": {
+                    str(k): v for k, v in sorted(self.branching.items())
+                },
+                "seconds": {
+                    "mean": self.seconds / generated,
+                    "max": self.max_seconds,
+                },
+            })
+        return summary
+
+
+def parse_seeds(spec: str) -> range:
+    """``N`` means seeds 0 to N - 1, and ``START:STOP`` is a half-open range"""
+    if ":" in spec:
+        start, stop = spec.split(":")
+        return range(int(start), int(stop))
+    return range(int(spec))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m adfod.sweep",
+        description="Check the dungeon generator over many seeds.")
+    parser.add_argument("-s", "--seeds", type=parse_seeds, default="100",
+                        help="N for seeds 0..N-1, or START:STOP")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="processes to use (default: one per CPU)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only print failures and summaries")
+    parser.add_argument("-e", "--every", type=int, default=100,
+                        help="print a running summary every N results for "
+                             "each combination of settings (default: 100)")
+    for name, value in dungeon_options().items():
+        parser.add_argument(f"--{name.replace('_', '-')}", nargs="+",
+                            type=type(value), default=[value])
+    args = parser.parse_args(argv)
+
+    grid = {name: getattr(args, name) for name in dungeon_options()}
+    summaries = {}
+    for result in sweep(args.seeds, grid, args.workers):
+        key = tuple(sorted(result["options"].items()))
+        if key not in summaries:
+            summaries[key] = Summary(result["options"])
+        summary = summaries[key]
+        summary.add(result)
+        if result["errors"] or not args.quiet:
+            print(json.dumps(result), flush=True)
+        if args.every > 0 and summary.runs % args.every == 0:
+            print(json.dumps(summary.as_dict()), flush=True)
+
+    for key in sorted(summaries):
+        print(json.dumps(summaries[key].as_dict(final=True)))
+
+    failed = any(summary.failures for summary in summaries.values())
+    return int(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())